@@ -7,7 +7,6 @@ import struct
 import argparse
 import sys
 import time
-import binascii
 import socket
 import atexit
   
@@ -20,6 +19,15 @@ args = parser.parse_args()
 z = args.interval
 meter = args.meter	
 
+	# Frame layouts, compiled once instead of per notification
+PACK_INFO = struct.Struct('>HhHHHHHH')		# volts, amps, remain, capacity, cycles, mdate, balance1, balance2
+PACK_STATUS = struct.Struct('>HBBBBBHHB')	# protect, vers, percent, fet, cells, sensors, temp1, temp2, b77
+CELLS = [struct.Struct('>%iH' % n) for n in range(9)]	# cell voltages in mV, indexed by cell count (1-8)
+
+	# JBD read requests: dd a5 <register> 00 <checksum> 77
+CMD_PACK_INFO = b'\xdd\xa5\x03\x00\xff\xfd\x77'		# x03 pack info
+CMD_CELL_VOLTAGES = b'\xdd\xa5\x04\x00\xff\xfc\x77'	# x04 cell voltages
+
 class StatsReporter:
     def __init__(
         self,
@@ -64,7 +72,7 @@ class StatsReporter:
 def cellinfo1(data):			# process pack info
     infodata = data
     i = 4                       # Unpack into variables, skipping header bytes 0-3
-    volts, amps, remain, capacity, cycles, mdate, balance1, balance2 = struct.unpack_from('>HhHHHHHH', infodata, i)
+    volts, amps, remain, capacity, cycles, mdate, balance1, balance2 = PACK_INFO.unpack_from(infodata, i)
     volts=volts/100
     amps = amps/100
     capacity = capacity/100
@@ -100,7 +108,7 @@ def cellinfo1(data):			# process pack info
 def cellinfo2(data):
     infodata = data  
     i = 0                          # unpack into variables, ignore end of message byte '77'
-    protect,vers,percent,fet,cells,sensors,temp1,temp2,b77 = struct.unpack_from('>HBBBBBHHB', infodata, i)
+    protect,vers,percent,fet,cells,sensors,temp1,temp2,b77 = PACK_STATUS.unpack_from(infodata, i)
     temp1 = (temp1-2731)/10
     temp2 = (temp2-2731)/10			# fet 0011 = 3 both on ; 0010 = 2 disch on ; 0001 = 1 chrg on ; 0000 = 0 both off
     prt = (format(protect, "b").zfill(16))		# protect trigger (0,1)(off,on)
@@ -129,9 +137,12 @@ def cellvolts1(data):			                # process cell voltages
     global cells1
     celldata = data
     i = 4                       # Unpack into variables, skipping header bytes 0-3
-    cell1, cell2, cell3, cell4, cell5, cell6, cell7, cell8 = struct.unpack_from('>HHHHHHHH', celldata, i)
-    cells1 = [cell1, cell2, cell3, cell4, cell5, cell6, cell7, cell8] 	# needed for max, min, delta calculations
-    message = ("meter,cell1,cell2,cell3,cell4,cell5,cell6,cell7,cell8\r\n%s,%0i,%0i,%0i,%0i,%0i,%0i,%0i,%0i" % (meter,cell1,cell2,cell3,cell4,cell5,cell6,cell7,cell8))
+    count = min(celldata[3] // 2, 8)	# length byte = 2 bytes per cell, packs may have fewer than 8
+    if count == 0:
+        return
+    cells1 = list(CELLS[count].unpack_from(celldata, i)) 	# needed for max, min, delta calculations
+    names = ','.join('cell%i' % (n + 1) for n in range(count))
+    message = ("meter,%s\r\n%s,%s" % (names, meter, ','.join('%0i' % cell for cell in cells1)))
     print(message)
     #reporter.send_data(message)
     cellmin = min(cells1)
@@ -144,17 +155,38 @@ def cellvolts1(data):			                # process cell voltages
 class MyDelegate(DefaultDelegate):		    # notification responses
 	def __init__(self):
 		DefaultDelegate.__init__(self)
+		self.frame = bytearray()				# reply reassembled from 20 byte notifications
+		self.replies = 0						# complete replies dispatched so far
 	def handleNotification(self, cHandle, data):
-		hex_data = binascii.hexlify(data) 		# Given raw bytes, get an ASCII string representing the hex values
-		text_string = hex_data.decode('utf-8')  # check incoming data for routing to decoding routines
-		if text_string.find('dd04') != -1:	                             # x04 (1-8 cells)	
-			cellvolts1(data)
-		elif text_string.find('dd03') != -1:                             # x03
-			cellinfo1(data)
-		#elif text_string.find('77') != -1 and len(text_string) == 38:	 # x04 (9-16 cells)
-		#	cellvolts2(data)
-		elif text_string.find('77') != -1 and len(text_string) == 28 or len(text_string) == 36:	 # x03
-			cellinfo2(data)		
+		if data[:2] in (b'\xdd\x03', b'\xdd\x04'):	# header starts a new reply
+			self.frame[:] = data
+		elif self.frame:
+			self.frame += data
+		else:
+			return								# stray tail of a reply we never saw start
+		if len(self.frame) < 4 or len(self.frame) < self.frame[3] + 7:
+			return								# dd, cmd, status, len, <len data bytes>, checksum(2), 77
+		frame = bytes(self.frame)
+		self.frame.clear()
+		if frame[frame[3] + 6] != 0x77:
+			return								# corrupted reply, drop it
+		if frame[1] == 0x04:	                             # x04 (1-8 cells, 9-16 would follow in the same frame)
+			cellvolts1(frame)
+		elif frame[1] == 0x03:                             # x03
+			cellinfo1(frame)
+			if len(frame) >= 20 + PACK_STATUS.size:
+				cellinfo2(frame[20:])				# status fields start at data byte 16
+		self.replies += 1
+
+def wait_for_reply(peripheral, delegate, timeout):	# handle notifications until a whole reply is in, or timeout
+	replies = delegate.replies
+	deadline = time.monotonic() + timeout
+	while delegate.replies == replies:
+		remaining = deadline - time.monotonic()
+		if remaining <= 0 or not peripheral.waitForNotifications(remaining):
+			return False
+	return True
+
 try:
     print('attempting to connect')		
     bms = Peripheral(args.BLEaddress,addrType="random")
@@ -168,7 +200,8 @@ except BTLEException as ex:
 else:
     print('connected ',args.BLEaddress)
 
-bms.setDelegate(MyDelegate())		# setup delegate for notifications
+delegate = MyDelegate()
+bms.setDelegate(delegate)		# setup delegate for notifications
 
 reporter = StatsReporter(
     (socket.AF_UNIX, ),
@@ -178,11 +211,11 @@ reporter = StatsReporter(
 atexit.register(reporter.close_socket)
 
 		# write empty data to 0x15 for notification request   --  address x03 handle for info & x04 handle for cell voltage
-		# using waitForNotifications(5) as less than 5 seconds has caused some missed notifications
+		# allowing 5 seconds per reply as less than 5 seconds has caused some missed notifications
 while True:
 	#print('sending')
-	result = bms.writeCharacteristic(0x15,b'\xdd\xa5\x03\x00\xff\xfd\x77',False)		# write x03 w/o response cell info
-	bms.waitForNotifications(5)
-	result = bms.writeCharacteristic(0x15,b'\xdd\xa5\x04\x00\xff\xfc\x77',False)		# write x04 w/o response cell voltages
-	bms.waitForNotifications(5)
+	result = bms.writeCharacteristic(0x15,CMD_PACK_INFO,False)		# write x03 w/o response cell info
+	wait_for_reply(bms, delegate, 5)		# x03 spans two notifications
+	result = bms.writeCharacteristic(0x15,CMD_CELL_VOLTAGES,False)		# write x04 w/o response cell voltages
+	wait_for_reply(bms, delegate, 5)
 	time.sleep(z)
\ No newline at end of file
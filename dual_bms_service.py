@@ -6,13 +6,24 @@ Provides REST API for UI to consume battery data with timestamps
 
 import sys
 import time
-import json
+import hashlib
 import logging
 import threading
 from datetime import datetime
-from typing import Optional, Dict
-from flask import Flask, jsonify
-from dataclasses import dataclass, asdict
+from typing import Optional
+from flask import Flask, request
+from flask.json.provider import DefaultJSONProvider
+from dataclasses import dataclass, replace
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from waitress import serve
+except ImportError:
+    serve = None
 
 try:
     from bluepy3.btle import Peripheral, DefaultDelegate, BTLEException
@@ -25,12 +36,54 @@ import os
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 # Copy the classes from jbd_bms_reader.py
-import binascii
 import struct
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+CLIENT_MAX_AGE = 2  # Cache-Control max-age for clients, in seconds
+
+# First UI battery number per track - left is 1-4, right is 5-8
+TRACK_BATTERY_BASE = {'left': 1, 'right': 5}
+
+# Failed polls in a row before a track's reader is thrown away and rebuilt
+MAX_CONSECUTIVE_FAILURES = 3
+
+def jbd_read_command(register: int) -> bytes:
+    """Build a JBD read request: DD A5 <register> 00 <checksum> 77"""
+    checksum = 0x10000 - register  # two's complement of register + zero length byte
+    return bytes([0xDD, 0xA5, register, 0x00]) + struct.pack('>H', checksum) + b'\x77'
+
+# JBD reply layouts, compiled once instead of per notification
+BASIC_INFO = struct.Struct('>HhHHHHHH')     # volts, amps, remain, capacity, cycles, mdate, balance1, balance2
+CELL_VOLTAGES = {n: struct.Struct('>%dH' % n) for n in range(1, 9)}  # first n cells in mV
+EXTENDED_INFO = struct.Struct('>HBBBBBHHB') # protect, vers, percent, fet, cells, sensors, temp1, temp2, b77
+
+# JBD request frames, built once at import
+CMD_BASIC_INFO = jbd_read_command(0x03)     # pack voltage/current/capacity + status tail
+CMD_CELL_VOLTAGES = jbd_read_command(0x04)  # per-cell voltages
+
+# JBD GATT layout: requests are written to FF02, replies are notified on FF01
+JBD_NOTIFY_UUID = 0xff01
+JBD_WRITE_UUID = 0xff02
+CCCD_UUID = 0x2902  # Client Characteristic Configuration descriptor
+DEFAULT_WRITE_HANDLE = 0x15  # FF02 value handle on the units this was written against
+
+# Bits for the replies a read waits on, keyed by the frame's command byte
+REPLY_BASIC_INFO = 0x1
+REPLY_CELL_VOLTAGES = 0x2
+REPLY_BITS = {0x03: REPLY_BASIC_INFO, 0x04: REPLY_CELL_VOLTAGES}
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson (compact, dict keys sorted)"""
+    def dumps(self, obj, **kwargs):
+        # json.dumps-style kwargs (indent, separators) have no orjson equivalent;
+        # the options below already match Flask's sorted, compact output
+        return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
 @dataclass
 class BatteryData:
     """Battery data structure"""
@@ -41,13 +94,28 @@ class BatteryData:
     full_capacity: float = 0.0
     soc: float = 0.0
     cycles: int = 0
-    cell_voltages: list = None
+    cell_voltages: tuple = None  # immutable, so published copies can share it
     last_update: Optional[str] = None
     connection_status: str = "disconnected"
 
+    def to_dict(self):
+        """Flat dict for the JSON responses - no fields() reflection or deep copy"""
+        return {
+            'track': self.track,
+            'voltage': self.voltage,
+            'current': self.current,
+            'remaining_capacity': self.remaining_capacity,
+            'full_capacity': self.full_capacity,
+            'soc': self.soc,
+            'cycles': self.cycles,
+            'cell_voltages': self.cell_voltages,
+            'last_update': self.last_update,
+            'connection_status': self.connection_status
+        }
+
     def __post_init__(self):
         if self.cell_voltages is None:
-            self.cell_voltages = []
+            self.cell_voltages = ()
 
 class JBDBMSDelegate(DefaultDelegate):
     """Notification delegate for JBD BMS responses"""
@@ -55,36 +123,49 @@ class JBDBMSDelegate(DefaultDelegate):
         DefaultDelegate.__init__(self)
         self.track = track
         self.battery_data = BatteryData(track=track)
-        self.last_notification = None
+        self.updated = 0  # bitmask of REPLY_* replies parsed, cleared and stamped once per read
+        self.frame = bytearray()  # reply being reassembled, reused across notifications
         
     def handleNotification(self, cHandle, data):
-        """Handle BMS notifications following working script pattern"""
+        """Reassemble a JBD reply from its notification fragments, then parse it"""
         try:
-            hex_data = binascii.hexlify(data)
-            text_string = hex_data.decode('utf-8')
+            if len(data) >= 2 and data[0] == 0xDD and data[1] in REPLY_BITS:
+                self.frame.clear()  # DD 03 / DD 04 starts a new reply
+            elif not self.frame:
+                return  # fragment of a reply whose start we missed
+            self.frame += data
+            
+            # Frame is DD <cmd> <status> <len> <payload...> <chk> <chk> 77
+            frame = self.frame
+            if len(frame) < 4 or len(frame) < frame[3] + 7:
+                return  # more fragments to come
             
-            if text_string.find('dd04') != -1:  # Cell voltages response
-                self.parse_cell_voltages(data)
-            elif text_string.find('dd03') != -1:  # Basic info response
-                self.parse_basic_info(data)
-            elif text_string.find('77') != -1 and (len(text_string) == 28 or len(text_string) == 36):
-                self.parse_extended_info(data)
+            # The parsers set the reply's bit in updated only when it parsed
+            if frame[frame[3] + 6] != 0x77:
+                logger.debug("%s: dropping malformed reply frame", self.track)
+            elif frame[1] == 0x04:  # Cell voltages response
+                self.parse_cell_voltages(frame)
+            else:  # Basic info response, status block included
+                self.parse_basic_info(frame)
+                self.parse_extended_info(frame)
+            frame.clear()
                 
         except Exception as e:
-            logger.error(f"Error handling notification for {self.track}: {e}")
+            self.frame.clear()
+            logger.error("Error handling notification for %s: %s", self.track, e)
     
     def parse_basic_info(self, data):
         """Parse basic pack info (0x03 response)"""
         try:
-            print(f"Basic info data length: {len(data)} bytes")
+            logger.debug("Basic info data length: %d bytes", len(data))
             
             # Check minimum buffer size (need 20 bytes: 4 header + 16 data)
             if len(data) < 20:
-                print(f"Buffer too small for basic info: {len(data)} bytes, need 20")
+                logger.debug("Buffer too small for basic info: %d bytes, need 20", len(data))
                 return
                 
             i = 4  # Skip header bytes 0-3
-            volts, amps, remain, capacity, cycles, mdate, balance1, balance2 = struct.unpack_from('>HhHHHHHH', data, i)
+            volts, amps, remain, capacity, cycles, mdate, balance1, balance2 = BASIC_INFO.unpack_from(data, i)
             
             # Convert to proper units
             self.battery_data.voltage = volts / 100.0
@@ -92,73 +173,74 @@ class JBDBMSDelegate(DefaultDelegate):
             self.battery_data.remaining_capacity = remain / 100.0
             self.battery_data.full_capacity = capacity / 100.0
             self.battery_data.cycles = cycles
-            self.battery_data.last_update = datetime.now().isoformat()
+            self.updated |= REPLY_BASIC_INFO
             
             # Calculate SOC as fallback if not set by extended info
             if self.battery_data.soc == 0.0 and self.battery_data.full_capacity > 0:
                 self.battery_data.soc = (self.battery_data.remaining_capacity / self.battery_data.full_capacity) * 100
-                print(f"✓ {self.track} SOC calculated: {self.battery_data.soc:.1f}%")
+                logger.debug("✓ %s SOC calculated: %.1f%%", self.track, self.battery_data.soc)
             
-            print(f"✓ {self.track} Pack: {self.battery_data.voltage:.2f}V, {self.battery_data.current:.2f}A, {self.battery_data.remaining_capacity:.1f}Ah")
+            logger.debug("✓ %s Pack: %.2fV, %.2fA, %.1fAh", self.track, self.battery_data.voltage,
+                         self.battery_data.current, self.battery_data.remaining_capacity)
             
         except Exception as e:
-            logger.error(f"Error parsing basic info for {self.track}: {e}")
-            print(f"Raw data: {binascii.hexlify(data).decode('utf-8')}")
+            logger.error("Error parsing basic info for %s: %s", self.track, e)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Raw data: %s", data.hex())
     
     def parse_cell_voltages(self, data):
         """Parse cell voltages (0x04 response)"""
         try:
-            print(f"Cell voltage data length: {len(data)} bytes")
+            logger.debug("Cell voltage data length: %d bytes", len(data))
             
             # Check minimum buffer size
             if len(data) < 8:  # Need at least header + some data
-                print(f"Buffer too small: {len(data)} bytes")
+                logger.debug("Buffer too small: %d bytes", len(data))
                 return
             
             i = 4  # Skip header bytes 0-3
-            available_bytes = len(data) - i
+            available_bytes = data[3]  # payload length - stops before the checksum
             
             # Calculate how many cells we can read (2 bytes per cell)
             max_cells = available_bytes // 2
-            print(f"Can read {max_cells} cells from {available_bytes} available bytes")
+            logger.debug("Can read %d cells from %d available bytes", max_cells, available_bytes)
             
             if max_cells == 0:
-                print("No cell data available")
+                logger.debug("No cell data available")
                 return
             
-            # Read available cells (up to 8)
-            cells = []
-            for cell_idx in range(min(max_cells, 8)):
-                if i + 1 < len(data):
-                    cell_value = struct.unpack_from('>H', data, i)[0]
-                    cells.append(cell_value)
-                    i += 2
-                else:
-                    break
+            # Read available cells (up to 8) in one unpack
+            cells = CELL_VOLTAGES[min(max_cells, 8)].unpack_from(data, i)
             
             # Convert to volts and filter out zero cells
-            self.battery_data.cell_voltages = [c / 1000.0 for c in cells if c > 0]
-            self.battery_data.last_update = datetime.now().isoformat()
+            self.battery_data.cell_voltages = tuple(c / 1000.0 for c in cells if c > 0)
+            self.updated |= REPLY_CELL_VOLTAGES
             
-            print(f"✓ {self.track} Cells ({len(cells)}): {[f'{c:.3f}V' for c in self.battery_data.cell_voltages]}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("✓ %s Cells (%d): %s", self.track, len(cells),
+                             [f'{c:.3f}V' for c in self.battery_data.cell_voltages])
             
         except Exception as e:
-            logger.error(f"Error parsing cell voltages for {self.track}: {e}")
-            print(f"Raw data: {binascii.hexlify(data).decode('utf-8')}")
+            logger.error("Error parsing cell voltages for %s: %s", self.track, e)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Raw data: %s", data.hex())
     
     def parse_extended_info(self, data):
         """Parse extended info (protection, SOC, etc.)"""
         try:
-            i = 0
-            protect, vers, percent, fet, cells, sensors, temp1, temp2, b77 = struct.unpack_from('>HBBBBBHHB', data, i)
+            i = 20  # Status block follows the 16 bytes of basic info
+            if len(data) < i + EXTENDED_INFO.size:
+                logger.debug("No status block in %d byte basic info reply", len(data))
+                return
+            
+            protect, vers, percent, fet, cells, sensors, temp1, temp2, b77 = EXTENDED_INFO.unpack_from(data, i)
             
             self.battery_data.soc = percent
-            self.battery_data.last_update = datetime.now().isoformat()
             
-            print(f"✓ {self.track} Extended: SOC {percent}%")
+            logger.debug("✓ %s Extended: SOC %d%%", self.track, percent)
             
         except Exception as e:
-            logger.error(f"Error parsing extended info for {self.track}: {e}")
+            logger.error("Error parsing extended info for %s: %s", self.track, e)
 
 class JBDBMSReader:
     """JBD BMS Reader using exact working script pattern"""
@@ -169,6 +251,31 @@ class JBDBMSReader:
         self.peripheral = None
         self.delegate = None
         self.connected = False
+        self.write_handle = None  # FF02 value handle, found once per connection
+        self.fresh = False  # True only when the last read_data() parsed both replies
+
+    def discover_handles(self):
+        """Look up the FF02 write handle and enable FF01 notifications"""
+        try:
+            notify_char = self.peripheral.getCharacteristics(uuid=JBD_NOTIFY_UUID)[0]
+            self.write_handle = self.peripheral.getCharacteristics(uuid=JBD_WRITE_UUID)[0].getHandle()
+        except (BTLEException, IndexError):
+            logger.warning("%s: JBD characteristics not found, writing to handle 0x%02x",
+                           self.track, DEFAULT_WRITE_HANDLE)
+            self.write_handle = DEFAULT_WRITE_HANDLE
+            return
+        
+        # Most units notify without a CCCD write, as the original script relied on,
+        # so a missing or failing descriptor is logged rather than fatal
+        try:
+            cccd = notify_char.getDescriptors(forUUID=CCCD_UUID)[0]
+            self.peripheral.writeCharacteristic(cccd.handle, b'\x01\x00', True)
+        except IndexError:
+            logger.warning("%s: no CCCD on the notify characteristic, not enabling notifications", self.track)
+        except BTLEException as e:
+            logger.warning("%s: could not enable notifications: %s", self.track, e)
+        logger.debug("%s: write handle 0x%02x, notify handle 0x%02x",
+                     self.track, self.write_handle, notify_char.getHandle())
 
     def connect(self):
         """Connect using exact pattern from working script"""
@@ -188,6 +295,7 @@ class JBDBMSReader:
             # Setup delegate for notifications
             self.delegate = JBDBMSDelegate(self.track)
             self.peripheral.setDelegate(self.delegate)
+            self.discover_handles()
             
             self.connected = True
             return True
@@ -203,18 +311,29 @@ class JBDBMSReader:
 
     def read_data(self):
         """Read BMS data using exact working script pattern"""
+        self.fresh = False
         if not self.connected or not self.peripheral:
             return False
         
         try:
-            # Write to handle 0x15 for basic info (0x03)
-            self.peripheral.writeCharacteristic(0x15, b'\xdd\xa5\x03\x00\xff\xfd\x77', False)
-            self.peripheral.waitForNotifications(5)
+            # The delegate outlives a poll, so only replies parsed by this read count
+            self.delegate.updated = 0
+            
+            # Write to FF02 for basic info (0x03)
+            self.peripheral.writeCharacteristic(self.write_handle, CMD_BASIC_INFO, False)
+            if not self.wait_for_reply(REPLY_BASIC_INFO):
+                logger.warning("%s basic info reply timed out", self.track)
+                return False
             
-            # Write to handle 0x15 for cell voltages (0x04)  
-            self.peripheral.writeCharacteristic(0x15, b'\xdd\xa5\x04\x00\xff\xfc\x77', False)
-            self.peripheral.waitForNotifications(5)
+            # Write to FF02 for cell voltages (0x04)  
+            self.peripheral.writeCharacteristic(self.write_handle, CMD_CELL_VOLTAGES, False)
+            if not self.wait_for_reply(REPLY_CELL_VOLTAGES):
+                logger.warning("%s cell voltage reply timed out", self.track)
+                return False
             
+            # One timestamp per poll instead of one per parsed notification
+            self.delegate.battery_data.last_update = datetime.now().isoformat()
+            self.fresh = True
             return True
             
         except BTLEException as e:
@@ -225,9 +344,20 @@ class JBDBMSReader:
             print(f"✗ {self.track} unexpected error: {e}")
             return False
 
+    def wait_for_reply(self, reply_bit, timeout=5.0):
+        """Handle notifications until the reply has been parsed or the timeout passes"""
+        deadline = time.monotonic() + timeout
+        while not self.delegate.updated & reply_bit:
+            remaining = deadline - time.monotonic()
+            # Returns as soon as one notification is handled (the delegate runs on
+            # this thread), so each call blocks only until the next fragment arrives
+            if remaining <= 0 or not self.peripheral.waitForNotifications(remaining):
+                return False
+        return True
+
     def get_battery_data(self):
-        """Get parsed battery data"""
-        if self.delegate and self.delegate.battery_data.last_update:
+        """Get the battery data stamped by the last read, or None"""
+        if self.fresh:
             return self.delegate.battery_data
         return None
 
@@ -243,7 +373,7 @@ class JBDBMSReader:
         self.connected = False
 
 class DualBMSService:
-    """Service that alternates between left and right BMS units"""
+    """Service that polls the left and right track BMS units side by side"""
     
     def __init__(self, left_mac: str, right_mac: str, poll_interval: int = 5):
         self.left_mac = left_mac
@@ -256,180 +386,281 @@ class DualBMSService:
             'right': BatteryData(track='right')
         }
         
+        # One long-lived reader per track; only a failed track is reconnected
+        self.readers = {
+            'left': JBDBMSReader(left_mac, 'left'),
+            'right': JBDBMSReader(right_mac, 'right')
+        }
+        self.failures = {'left': 0, 'right': 0}
+        
+        # /api/batteries entries per track, rebuilt only when that track is polled
+        self.track_batteries = {track: self.build_track_batteries(track) for track in ('left', 'right')}
+        
         # Service control
-        self.running = False
-        self.thread = None
+        self._stop = threading.Event()
+        self._stop.set()  # set while stopped, so the poll loops wake up as soon as stop is requested
+        self.threads = []
+        self.last_poll = None  # ISO time of the most recent poll, stamped once per poll
+        
+        # Serializes publishing, so two tracks finishing together can't publish a stale mix
+        self._build_lock = threading.Lock()
         
         # Flask app for API
         self.app = Flask(__name__)
+        if orjson is not None:
+            self.app.json = OrjsonProvider(self.app)
+        
+        # Bodies only change when a poll lands or the service starts/stops: key -> (bytes, ETag)
+        self._rendered = self.render_poll_responses()
         self.setup_routes()
     
+    def build_track_batteries(self, track: str):
+        """Build the UI entries for one track's 4 batteries"""
+        data = self.battery_data[track]
+        base = TRACK_BATTERY_BASE[track]
+        # Pack-level values are shared by all 4 entries
+        amperage = round(abs(data.current), 1)
+        charge_level = round(data.soc, 0)
+        status = 'normal' if data.connection_status == 'connected' else 'warning'
+        batteries = []
+        for i in range(4):
+            # If we have cell voltage data, use it, otherwise use pack voltage / 4
+            if data.cell_voltages and len(data.cell_voltages) > i:
+                cell_voltage = data.cell_voltages[i]
+            else:
+                cell_voltage = data.voltage / 4 if data.voltage > 0 else 3.2
+        
+            batteries.append({
+                'batteryNumber': base + i,
+                'voltage': round(cell_voltage, 2),
+                'amperage': amperage,
+                'chargeLevel': charge_level,
+                'temperature': 25,  # Default temperature
+                'status': status,
+                'track': track,
+                'trackPosition': i + 1
+            })
+        return batteries
+
+    def build_batteries_payload(self):
+        """Build the /api/batteries payload - left/right tracks with 4 cells each"""
+        batteries = self.track_batteries['left'] + self.track_batteries['right']
+        
+        left_data = self.battery_data['left']
+        right_data = self.battery_data['right']
+        logger.debug("Batteries payload rebuilt - %d batteries", len(batteries))
+        logger.debug("Left: %.2fV, %.1f%%, status: %s", left_data.voltage, left_data.soc, left_data.connection_status)
+        logger.debug("Right: %.2fV, %.1f%%, status: %s", right_data.voltage, right_data.soc, right_data.connection_status)
+        return batteries
+
+    def build_bms_status_payload(self):
+        """Build the /api/bms/status payload"""
+        left_data = self.battery_data['left']
+        right_data = self.battery_data['right']
+        left_connected = left_data.connection_status == 'connected'
+        right_connected = right_data.connection_status == 'connected'
+        
+        status = {
+            'connected': left_connected or right_connected,
+            'left': left_connected,
+            'right': right_connected,
+            'tracks': {
+                'left': left_connected,
+                'right': right_connected
+            },
+            'devices': {
+                self.left_mac: {
+                    'track': 'left',
+                    'connected': left_connected,
+                    'lastData': left_data.last_update
+                },
+                self.right_mac: {
+                    'track': 'right',
+                    'connected': right_connected,
+                    'lastData': right_data.last_update
+                }
+            }
+        }
+        logger.debug("BMS status payload rebuilt - Left: %s, Right: %s", status['left'], status['right'])
+        return status
+
+    def render(self, payload):
+        """Serialize a payload once: (body bytes, ETag)"""
+        body = self.app.json.dumps(payload).encode('utf-8')
+        return body, hashlib.blake2b(body, digest_size=8).hexdigest()
+
+    def json_response(self, rendered):
+        """Response for a rendered body - 304 if the client already holds this version"""
+        body, etag = rendered
+        response = self.app.response_class(body, mimetype='application/json')
+        response.set_etag(etag)
+        response.cache_control.public = True
+        response.cache_control.max_age = CLIENT_MAX_AGE
+        return response.make_conditional(request)
+
+    def render_poll_responses(self):
+        """Serialize every payload once, for every GET until the next poll"""
+        left = self.battery_data['left'].to_dict()
+        right = self.battery_data['right'].to_dict()
+        payloads = {
+            'batteries': self.build_batteries_payload(),
+            'bms_status': self.build_bms_status_payload(),
+            'battery_status': {
+                'left': left,
+                'right': right,
+                'service_status': 'running' if self.running else 'stopped',
+                'last_poll': self.last_poll
+            },
+            'left': left,
+            'right': right
+        }
+        return {key: self.render(payload) for key, payload in payloads.items()}
+
+    def refresh_responses(self):
+        """Re-render the responses outside a poll (service started or stopped)"""
+        with self._build_lock:
+            self._rendered = self.render_poll_responses()
+
+    def serve_rendered(self, key):
+        """Serve a body rendered by the last poll"""
+        return self.json_response(self._rendered[key])
+
     def setup_routes(self):
         """Setup Flask API routes"""
         
         @self.app.route('/api/batteries', methods=['GET'])
         def get_batteries():
             """Get battery data in format expected by UI - left/right tracks with 4 cells each"""
-            batteries = []
-            
-            # Generate left track batteries (positions 1-4)
-            left_data = self.battery_data['left']
-            for i in range(4):
-                # If we have cell voltage data, use it, otherwise use pack voltage / 4
-                if left_data.cell_voltages and len(left_data.cell_voltages) > i:
-                    cell_voltage = left_data.cell_voltages[i]
-                else:
-                    cell_voltage = left_data.voltage / 4 if left_data.voltage > 0 else 3.2
-                
-                batteries.append({
-                    'batteryNumber': i + 1,
-                    'voltage': round(cell_voltage, 2),
-                    'amperage': round(abs(left_data.current), 1),
-                    'chargeLevel': round(left_data.soc, 0),
-                    'temperature': 25,  # Default temperature
-                    'status': 'normal' if left_data.connection_status == 'connected' else 'warning',
-                    'track': 'left',
-                    'trackPosition': i + 1
-                })
-            
-            # Generate right track batteries (positions 1-4)
-            right_data = self.battery_data['right']
-            for i in range(4):
-                # If we have cell voltage data, use it, otherwise use pack voltage / 4
-                if right_data.cell_voltages and len(right_data.cell_voltages) > i:
-                    cell_voltage = right_data.cell_voltages[i]
-                else:
-                    cell_voltage = right_data.voltage / 4 if right_data.voltage > 0 else 3.2
-                
-                batteries.append({
-                    'batteryNumber': i + 5,  # 5-8 for right track
-                    'voltage': round(cell_voltage, 2),
-                    'amperage': round(abs(right_data.current), 1),
-                    'chargeLevel': round(right_data.soc, 0),
-                    'temperature': 25,  # Default temperature
-                    'status': 'normal' if right_data.connection_status == 'connected' else 'warning',
-                    'track': 'right',
-                    'trackPosition': i + 1
-                })
-            
-            logger.debug(f"Batteries API called - returning {len(batteries)} batteries")
-            logger.debug(f"Left: {left_data.voltage:.2f}V, {left_data.soc:.1f}%, status: {left_data.connection_status}")
-            logger.debug(f"Right: {right_data.voltage:.2f}V, {right_data.soc:.1f}%, status: {right_data.connection_status}")
-            return jsonify(batteries)
+            return self.serve_rendered('batteries')
         
         @self.app.route('/api/bms/status', methods=['GET'])
         def get_bms_status():
             """Get BMS connection status in format expected by UI"""
-            status = {
-                'connected': any(data.connection_status == 'connected' for data in self.battery_data.values()),
-                'left': self.battery_data['left'].connection_status == 'connected',
-                'right': self.battery_data['right'].connection_status == 'connected',
-                'tracks': {
-                    'left': self.battery_data['left'].connection_status == 'connected',
-                    'right': self.battery_data['right'].connection_status == 'connected'
-                },
-                'devices': {
-                    self.left_mac: {
-                        'track': 'left',
-                        'connected': self.battery_data['left'].connection_status == 'connected',
-                        'lastData': self.battery_data['left'].last_update
-                    },
-                    self.right_mac: {
-                        'track': 'right', 
-                        'connected': self.battery_data['right'].connection_status == 'connected',
-                        'lastData': self.battery_data['right'].last_update
-                    }
-                }
-            }
-            logger.debug(f"BMS Status API called - Left: {status['left']}, Right: {status['right']}")
-            return jsonify(status)
+            return self.serve_rendered('bms_status')
         
         @self.app.route('/api/battery/status', methods=['GET'])
         def get_battery_status():
             """Get current battery status for both tracks"""
-            return jsonify({
-                'left': asdict(self.battery_data['left']),
-                'right': asdict(self.battery_data['right']),
-                'service_status': 'running' if self.running else 'stopped',
-                'last_poll': datetime.now().isoformat()
-            })
+            return self.serve_rendered('battery_status')
         
         @self.app.route('/api/battery/left', methods=['GET'])
         def get_left_battery():
             """Get left track battery data"""
-            return jsonify(asdict(self.battery_data['left']))
+            return self.serve_rendered('left')
         
         @self.app.route('/api/battery/right', methods=['GET'])
         def get_right_battery():
             """Get right track battery data"""
-            return jsonify(asdict(self.battery_data['right']))
+            return self.serve_rendered('right')
+    
+    @property
+    def running(self):
+        """True between start_service and stop_service"""
+        return not self._stop.is_set()
     
-    def poll_bms_data(self):
-        """Main polling loop - alternates between left and right with longer delays"""
-        logger.info("Starting BMS polling service...")
+    def poll_bms_data(self, mac_address: str, track: str):
+        """Polling loop for one track - each track runs on its own thread"""
+        logger.info("Starting BMS polling for %s track...", track)
         
-        while self.running:
-            # Poll left track
-            self.poll_single_bms(self.left_mac, 'left')
-            
-            if not self.running:
-                break
-                
-            # Longer pause between tracks to let BMS recover
-            time.sleep(10)
-            
-            # Poll right track
-            self.poll_single_bms(self.right_mac, 'right')
-            
-            if not self.running:
-                break
+        try:
+            while self.running:
+                started = time.monotonic()
+                self.poll_single_bms(mac_address, track)
                 
-            # Wait for next cycle - much longer to prevent device lockup
-            time.sleep(self.poll_interval + 15)
+                # Wait for next cycle - much longer to prevent device lockup. Time spent
+                # polling counts toward the period, so slow reads don't stretch the cycle.
+                # Returns early (True) when stop_service is called.
+                if self._stop.wait(max(0, self.poll_interval + 15 - (time.monotonic() - started))):
+                    break
+        finally:
+            # Links are kept open between polls. Only this thread uses this track's
+            # peripheral (bluepy isn't thread-safe), so it closes the link itself.
+            self.readers[track].disconnect()
     
     def poll_single_bms(self, mac_address: str, track: str):
-        """Poll a single BMS unit"""
-        reader = JBDBMSReader(mac_address, track)
+        """Poll a single BMS unit, reusing its connection from the previous poll"""
+        reader = self.readers[track]
         
         try:
-            if reader.connect():
-                reader.read_data()
-                data = reader.get_battery_data()
+            if reader.connected or reader.connect():
+                data = reader.get_battery_data() if reader.read_data() else None
                 if data:
-                    self.battery_data[track] = data
+                    # Publish a copy - the delegate keeps updating its own instance
+                    self.battery_data[track] = replace(data, connection_status="connected")
+                    self.failures[track] = 0
                     print(f"✓ {track} data updated: {data.voltage:.2f}V, {data.soc:.1f}%")
                 else:
                     print(f"⚠ {track} no data received")
-                    self.battery_data[track].connection_status = "no_data"
+                    self.publish_status(track, "no_data")
+                    self.record_failure(track)
             else:
                 print(f"✗ {track} connection failed")
-                self.battery_data[track].connection_status = "connection_failed"
+                self.publish_status(track, "connection_failed")
+                self.record_failure(track)
                 
         except Exception as e:
             print(f"✗ {track} polling error: {e}")
-            self.battery_data[track].connection_status = "error"
+            self.publish_status(track, "error")
+            self.record_failure(track)
         finally:
-            reader.disconnect()
+            # New data or status - rebuild this track's entries and re-render the responses
+            with self._build_lock:
+                self.last_poll = datetime.now().isoformat()
+                self.track_batteries[track] = self.build_track_batteries(track)
+                self._rendered = self.render_poll_responses()
+    
+    def publish_status(self, track: str, status: str):
+        """Publish a copy with the new status - published BatteryData is never mutated in place"""
+        self.battery_data[track] = replace(self.battery_data[track], connection_status=status)
+    
+    def record_failure(self, track: str):
+        """Drop the failed track's link; rebuild its reader after repeated failures"""
+        reader = self.readers[track]
+        reader.disconnect()
+        self.failures[track] += 1
+        if self.failures[track] >= MAX_CONSECUTIVE_FAILURES:
+            logger.warning("%s failed %d polls in a row, resetting reader", track, self.failures[track])
+            self.readers[track] = JBDBMSReader(reader.mac_address, track)
+            self.failures[track] = 0
     
     def start_service(self):
         """Start the polling service"""
         if not self.running:
-            self.running = True
-            self.thread = threading.Thread(target=self.poll_bms_data, daemon=True)
-            self.thread.start()
+            # A thread that outlived stop_service's join still owns its track's peripheral
+            busy = [thread.name for thread in self.threads if thread.is_alive()]
+            if busy:
+                logger.warning("Not starting - %s still stopping", ", ".join(busy))
+                return
+            self._stop.clear()
+            self.refresh_responses()  # service_status is now running
+            # Separate links per track, so the two BLE round-trips overlap instead of queueing
+            self.threads = [
+                threading.Thread(target=self.poll_bms_data, args=(mac, track), name=f"bms-{track}", daemon=True)
+                for mac, track in ((self.left_mac, 'left'), (self.right_mac, 'right'))
+            ]
+            for thread in self.threads:
+                thread.start()
             logger.info("BMS service started")
     
     def stop_service(self):
         """Stop the polling service"""
-        self.running = False
-        if self.thread:
-            self.thread.join(timeout=10)
+        self._stop.set()
+        self.refresh_responses()  # service_status is now stopped
+        for thread in self.threads:
+            # Each poll thread disconnects its own reader on the way out
+            thread.join(timeout=10)
+            if thread.is_alive():
+                logger.warning("%s still in a BLE read, it will disconnect when it finishes", thread.name)
         logger.info("BMS service stopped")
     
     def run_api_server(self, host='0.0.0.0', port=8000):
         """Run the Flask API server"""
-        logger.info(f"Starting API server on {host}:{port}")
-        self.app.run(host=host, port=port, debug=False)
+        logger.info("Starting API server on %s:%s", host, port)
+        if serve is not None:
+            serve(self.app, host=host, port=port, threads=4)
+        else:
+            # Werkzeug development server, if waitress isn't installed
+            self.app.run(host=host, port=port, debug=False)
 
 if __name__ == "__main__":
     # Configuration
@@ -444,9 +675,11 @@ if __name__ == "__main__":
         # Start polling service
         service.start_service()
         
-        # Run API server (blocking)
+        # Run API server (blocking) - waitress handles Ctrl+C itself and just returns
         service.run_api_server(host='0.0.0.0', port=8000)
         
     except KeyboardInterrupt:
+        pass
+    finally:
         logger.info("Shutting down...")
         service.stop_service()
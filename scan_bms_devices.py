@@ -10,6 +10,12 @@ except ImportError:
     print("ERROR: bluepy3 not installed. Run: pip install bluepy3")
     sys.exit(1)
 
+# GATT characteristic property bits (Bluetooth Core Spec Vol 3, Part G, 3.3.1.1)
+PROP_READ = 0x02
+PROP_WRITE_NO_RESP = 0x04
+PROP_WRITE = 0x08
+PROP_NOTIFY = 0x10
+
 class ScanDelegate(DefaultDelegate):
     def __init__(self):
         DefaultDelegate.__init__(self)
@@ -77,12 +83,13 @@ def test_connection(device):
             try:
                 characteristics = service.getCharacteristics()
                 for char in characteristics:
+                    bits = char.properties  # read the bitmask once
                     props = []
-                    if char.supportsRead():
+                    if bits & PROP_READ:
                         props.append("READ")
-                    if char.supportsWrite():
+                    if bits & (PROP_WRITE | PROP_WRITE_NO_RESP):
                         props.append("WRITE")
-                    if char.supportsNotify():
+                    if bits & PROP_NOTIFY:
                         props.append("NOTIFY")
                     
                     print(f"    Char: {char.uuid} ({', '.join(props)})")